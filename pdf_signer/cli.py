@@ -0,0 +1,126 @@
+import argparse
+import getpass
+import sys
+import time
+
+from pdf_signer.core.backends import create_backend
+from pdf_signer.core.config import BACKENDS, load_config
+from pdf_signer.core.deferred import DEFAULT_BYTES_RESERVED, embed_signatures, prepare_pdfs, sign_manifest
+from pdf_signer.core.signer import PdfSigner
+from pdf_signer.core.token_manager import TokenManager
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="pdf-signer",
+        description="Sign PDF files in place without the GUI.",
+    )
+    parser.add_argument("files", nargs="*", help="PDF files to sign (or prepare, with --prepare)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--prepare", metavar="MANIFEST",
+                      help="deferred phase 1: write .prepared.pdf copies with signature placeholders and a digest manifest")
+    mode.add_argument("--sign-manifest", metavar="MANIFEST",
+                      help="deferred phase 2: sign the digests in MANIFEST and write them to --out")
+    mode.add_argument("--embed", metavar="SIGNED_MANIFEST",
+                      help="deferred phase 3: embed the signatures from SIGNED_MANIFEST and replace the originals")
+    parser.add_argument("--out", help="signed manifest written by --sign-manifest")
+    parser.add_argument("--reserve", type=int, default=DEFAULT_BYTES_RESERVED,
+                        help="hex characters reserved for each signature by --prepare")
+    parser.add_argument("--backend", choices=BACKENDS, help="signer backend (default: PDF_SIGNER_BACKEND or pkcs11)")
+    parser.add_argument("--key", dest="key_path", help="PKCS#12 file or PEM/DER private key")
+    parser.add_argument("--cert", dest="cert_path", help="certificate file for a PEM/DER key")
+    parser.add_argument("--passphrase", help="key passphrase")
+    parser.add_argument("--latency", type=float, help="seconds added per signature by the simulated backend")
+    parser.add_argument("--lib", help="PKCS#11 library path (default: auto-detect)")
+    parser.add_argument("--slot", type=int, default=0, help="token index for the pkcs11 backend")
+    args = parser.parse_args(argv)
+    if not args.files and not (args.sign_manifest or args.embed):
+        parser.error("no PDF files given")
+    if args.files and (args.sign_manifest or args.embed):
+        parser.error("--sign-manifest and --embed take no PDF files")
+    if args.sign_manifest and not args.out:
+        parser.error("--sign-manifest needs --out")
+    return args
+
+
+def _report(results, elapsed: float) -> int:
+    fail = 0
+    for path, ok, message in results:
+        if ok:
+            print(f"OK    {path}: {message}")
+        else:
+            print(f"FAIL  {path}: {message}", file=sys.stderr)
+            fail += 1
+    print(f"Done: {len(results) - fail} ok, {fail} failed in {elapsed:.3f}s")
+    return 1 if fail else 0
+
+
+def _token_backend(args, config, token_manager):
+    if args.lib:
+        token_manager.load_library(args.lib)
+    elif token_manager.auto_detect_library() is None:
+        raise RuntimeError("No PKCS#11 library found, pass --lib")
+    tokens = token_manager.get_tokens()
+    if args.slot >= len(tokens):
+        raise RuntimeError("No crypto token detected")
+    token_info = tokens[args.slot]
+    pin = getpass.getpass(f"PIN for {token_info['label']}: ")
+    token_manager.open_session(token_info["slot_index"], pin)
+    certs = token_manager.list_certificates()
+    if not certs:
+        raise RuntimeError("No signing certificates found on this token")
+    return create_backend(config, token_manager.session, certs[0])
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    token_manager = TokenManager()
+    try:
+        config = load_config({
+            "backend": args.backend,
+            "key_path": args.key_path,
+            "cert_path": args.cert_path,
+            "passphrase": args.passphrase,
+            "latency": args.latency,
+        })
+
+        # Phases 1 and 3 only touch files, so they need no key or token
+        if args.prepare:
+            start = time.perf_counter()
+            results = prepare_pdfs(args.files, args.prepare, args.reserve)
+            return _report(results, time.perf_counter() - start)
+        if args.embed:
+            start = time.perf_counter()
+            results = embed_signatures(args.embed)
+            return _report(results, time.perf_counter() - start)
+
+        if config["backend"] == "pkcs11":
+            backend = _token_backend(args, config, token_manager)
+        else:
+            backend = create_backend(config)
+
+        if args.sign_manifest:
+            start = time.perf_counter()
+            results = sign_manifest(args.sign_manifest, backend, args.out)
+            return _report(results, time.perf_counter() - start)
+
+        signer = PdfSigner(backend)
+        results = []
+        batch_start = time.perf_counter()
+        for path in args.files:
+            start = time.perf_counter()
+            try:
+                signer.sign_pdf(path)
+                results.append((path, True, f"signed in {time.perf_counter() - start:.3f}s"))
+            except Exception as e:
+                results.append((path, False, f"{e} (after {time.perf_counter() - start:.3f}s)"))
+        return _report(results, time.perf_counter() - batch_start)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        token_manager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+from pyhanko.sign import signers
+from pyhanko.sign.pkcs11 import PKCS11Signer
+
+
+class SignerBackend(ABC):
+    """Provides the pyHanko signer that PdfSigner uses to produce signatures."""
+
+    name = "base"
+
+    @abstractmethod
+    def get_signer(self) -> signers.Signer:
+        ...
+
+
+class Pkcs11Backend(SignerBackend):
+    """Signs with a key on a PKCS#11 token through an open session."""
+
+    name = "pkcs11"
+
+    def __init__(self, session, cert_info: dict):
+        self._session = session
+        self._cert_id = cert_info["id"]
+        self._signer = None
+
+    def get_signer(self) -> signers.Signer:
+        # One signer per batch, so the certificate is read from the token once
+        if self._signer is None:
+            self._signer = PKCS11Signer(
+                self._session,
+                cert_id=self._cert_id,
+                key_id=self._cert_id,
+            )
+        return self._signer
+
+
+class SoftKeyBackend(SignerBackend):
+    """Signs in-process with a PKCS#12 file or a PEM/DER key and certificate."""
+
+    name = "softkey"
+
+    def __init__(self, key_path: str, cert_path: str | None = None, passphrase: str | None = None):
+        pw = passphrase.encode() if passphrase else None
+        if key_path.lower().endswith((".p12", ".pfx")):
+            signer = signers.SimpleSigner.load_pkcs12(key_path, passphrase=pw)
+        else:
+            if not cert_path:
+                raise ValueError("A certificate file is required with a PEM/DER key")
+            signer = signers.SimpleSigner.load(key_path, cert_path, key_passphrase=pw)
+        if signer is None:
+            raise ValueError(f"Could not load signing key from {key_path}")
+        self._signer = signer
+
+    def get_signer(self) -> signers.Signer:
+        return self._signer
+
+
+class _DelayedSigner(signers.Signer):
+    """Wraps another signer and sleeps before each raw signature."""
+
+    def __init__(self, inner: signers.Signer, latency: float):
+        super().__init__(
+            signing_cert=inner.signing_cert,
+            cert_registry=inner.cert_registry,
+            signature_mechanism=inner.signature_mechanism,
+        )
+        self._inner = inner
+        self._latency = latency
+
+    async def async_sign_raw(self, data: bytes, digest_algorithm: str, dry_run=False) -> bytes:
+        if not dry_run:
+            await asyncio.sleep(self._latency)
+        return await self._inner.async_sign_raw(data, digest_algorithm, dry_run)
+
+
+class SimulatedBackend(SignerBackend):
+    """Adds a fixed per-signature delay to another backend to mimic a token."""
+
+    name = "simulated"
+
+    def __init__(self, inner: SignerBackend, latency: float):
+        self._signer = _DelayedSigner(inner.get_signer(), latency)
+
+    def get_signer(self) -> signers.Signer:
+        return self._signer
+
+
+def create_backend(config: dict, session=None, cert_info: dict | None = None) -> SignerBackend:
+    """Build the backend selected by ``config["backend"]``.
+
+    The PKCS#11 backend needs a logged-in ``session`` and ``cert_info`` from
+    TokenManager; the other backends only use the key settings in ``config``.
+    """
+    kind = config["backend"]
+    if kind == "pkcs11":
+        if session is None or cert_info is None:
+            raise ValueError("The pkcs11 backend needs a token session and certificate")
+        return Pkcs11Backend(session, cert_info)
+    if kind not in ("softkey", "simulated"):
+        raise ValueError(f"Unknown signer backend: {kind}")
+    if not config.get("key_path"):
+        raise ValueError(f"The {kind} backend needs a key file (PDF_SIGNER_KEY or --key)")
+    backend = SoftKeyBackend(config["key_path"], config.get("cert_path"), config.get("passphrase"))
+    if kind == "simulated":
+        backend = SimulatedBackend(backend, config.get("latency", 0.0))
+    return backend
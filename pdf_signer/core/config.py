@@ -0,0 +1,54 @@
+import os
+
+from pdf_signer.core.token_manager import TokenManager
+
+
+BACKENDS = ("pkcs11", "softkey", "simulated")
+
+
+def default_config() -> dict:
+    """Settings used when nothing is configured: sign with the token."""
+    return {
+        "backend": "pkcs11",
+        "key_path": None,
+        "cert_path": None,
+        "passphrase": None,
+        "latency": 0.5,
+        "session_timeout": TokenManager.DEFAULT_IDLE_TIMEOUT,
+    }
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number of seconds, got {value!r}") from None
+
+
+def load_config(overrides: dict | None = None) -> dict:
+    """Read signing settings from PDF_SIGNER_* environment variables.
+
+    ``overrides`` (e.g. parsed command-line options) take precedence over the
+    environment; ``None`` values in it are ignored. Invalid values raise
+    ValueError with a message naming the offending setting.
+    """
+    config = default_config()
+    config.update({
+        "backend": os.environ.get("PDF_SIGNER_BACKEND", config["backend"]).lower(),
+        "key_path": os.environ.get("PDF_SIGNER_KEY"),
+        "cert_path": os.environ.get("PDF_SIGNER_CERT"),
+        "passphrase": os.environ.get("PDF_SIGNER_KEY_PASSPHRASE"),
+        "latency": _env_float("PDF_SIGNER_SIM_LATENCY", config["latency"]),
+        "session_timeout": _env_float("PDF_SIGNER_SESSION_TIMEOUT", config["session_timeout"]),
+    })
+    for key, value in (overrides or {}).items():
+        if value is not None:
+            config[key] = value
+    if config["backend"] not in BACKENDS:
+        raise ValueError(
+            f"Unknown signer backend {config['backend']!r}, expected one of: {', '.join(BACKENDS)}"
+        )
+    return config
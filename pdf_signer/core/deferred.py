@@ -0,0 +1,159 @@
+import asyncio
+import base64
+import hashlib
+import json
+from io import BytesIO
+from pathlib import Path
+
+from pyhanko.sign import signers
+from pyhanko.sign.signers.pdf_byterange import PreparedByteRangeDigest
+from pyhanko.sign.signers.pdf_cms import ExternalSigner
+from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+
+from pdf_signer.core.signer import signature_metadata
+
+MANIFEST_VERSION = 1
+MD_ALGORITHM = "sha256"
+# Hex characters reserved for the CMS blob, i.e. room for 8 KiB of DER
+DEFAULT_BYTES_RESERVED = 16384
+
+
+def _read_manifest(manifest_path: str) -> dict:
+    manifest = json.loads(Path(manifest_path).read_text())
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version: {manifest.get('version')}")
+    if manifest.get("md_algorithm") != MD_ALGORITHM:
+        raise ValueError(f"Unsupported manifest digest algorithm: {manifest.get('md_algorithm')}")
+    return manifest
+
+
+def _write_manifest(manifest_path: str, documents: list[dict]) -> None:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "md_algorithm": MD_ALGORITHM,
+        "documents": documents,
+    }
+    Path(manifest_path).write_text(json.dumps(manifest, indent=2))
+
+
+def prepare_pdf(pdf_path: str, bytes_reserved: int = DEFAULT_BYTES_RESERVED) -> dict:
+    """Write a copy of the PDF with a signature placeholder and return its manifest entry.
+
+    The original file is left untouched until ``embed_signature`` replaces it
+    with the signed copy, so an abandoned run never blocks later signing.
+    """
+    path = Path(pdf_path)
+    pdf_bytes = path.read_bytes()
+    prepared_path = path.with_name(path.stem + ".prepared.pdf")
+
+    # No key is needed here: the placeholder size is fixed and the digest
+    # only covers the document bytes around it
+    pdf_signer = signers.PdfSigner(
+        signature_metadata(md_algorithm=MD_ALGORITHM),
+        signer=ExternalSigner(None, None),
+    )
+    try:
+        w = IncrementalPdfFileWriter(BytesIO(pdf_bytes))
+        prepared, _, output = asyncio.run(
+            pdf_signer.async_digest_doc_for_signing(w, bytes_reserved=bytes_reserved)
+        )
+        prepared_path.write_bytes(output.getbuffer())
+    except Exception:
+        if prepared_path.exists():
+            prepared_path.unlink()
+        raise
+
+    return {
+        "path": str(path.resolve()),
+        "prepared_path": str(prepared_path.resolve()),
+        "original_digest": hashlib.new(MD_ALGORITHM, pdf_bytes).hexdigest(),
+        "digest": prepared.document_digest.hex(),
+        "reserved_region": [prepared.reserved_region_start, prepared.reserved_region_end],
+    }
+
+
+def prepare_pdfs(pdf_paths: list[str], manifest_path: str,
+                 bytes_reserved: int = DEFAULT_BYTES_RESERVED) -> list[tuple[str, bool, str]]:
+    """Phase one: prepare every PDF and write the digest manifest.
+
+    Returns ``(path, success, message)`` for each input; failed files are left
+    out of the manifest.
+    """
+    documents = []
+    results = []
+    for path in pdf_paths:
+        try:
+            documents.append(prepare_pdf(path, bytes_reserved))
+            results.append((path, True, "Pregatit"))
+        except Exception as e:
+            results.append((path, False, str(e)))
+    _write_manifest(manifest_path, documents)
+    return results
+
+
+async def _sign_digests(signer, documents: list[dict]) -> list[tuple[str, bool, str]]:
+    results = []
+    for doc in documents:
+        try:
+            cms = await signer.async_sign(bytes.fromhex(doc["digest"]), MD_ALGORITHM)
+            der = cms.dump()
+            # Hex-encoded CMS must fit between the < > delimiters of the placeholder
+            start, end = doc["reserved_region"]
+            if 2 * len(der) > end - start - 2:
+                raise ValueError(
+                    f"Signature needs {2 * len(der)} bytes but only {end - start - 2} were "
+                    "reserved; prepare again with a larger --reserve"
+                )
+            doc["cms"] = base64.b64encode(der).decode("ascii")
+            results.append((doc["path"], True, "Semnat cu succes"))
+        except Exception as e:
+            results.append((doc["path"], False, str(e)))
+    return results
+
+
+def sign_manifest(manifest_path: str, backend, output_path: str) -> list[tuple[str, bool, str]]:
+    """Phase two: sign every digest in the manifest and write the signed manifest.
+
+    Only the digests are signed; the PDFs themselves are never read here.
+    """
+    manifest = _read_manifest(manifest_path)
+    documents = manifest["documents"]
+    results = asyncio.run(_sign_digests(backend.get_signer(), documents))
+    _write_manifest(output_path, [doc for doc in documents if "cms" in doc])
+    return results
+
+
+def embed_signature(doc: dict) -> None:
+    """Write one CMS blob into its prepared PDF, then replace the original with it.
+
+    Both the prepared copy and the original must still match the manifest, so
+    changes made to the original after phase one are never overwritten.
+    """
+    if "cms" not in doc:
+        raise ValueError("Manifest has not been signed; run --sign-manifest first")
+    original = Path(doc["path"])
+    if hashlib.new(MD_ALGORITHM, original.read_bytes()).hexdigest() != doc["original_digest"]:
+        raise ValueError("Original changed since it was prepared; prepare it again")
+    start, end = doc["reserved_region"]
+    digest = bytes.fromhex(doc["digest"])
+    prepared_path = Path(doc["prepared_path"])
+    with open(prepared_path, "r+b") as f:
+        data = f.read()
+        if hashlib.new(MD_ALGORITHM, data[:start] + data[end:]).digest() != digest:
+            raise ValueError("Document changed since it was prepared")
+        prepared = PreparedByteRangeDigest(digest, start, end)
+        prepared.fill_with_cms(f, base64.b64decode(doc["cms"]))
+    prepared_path.replace(original)
+
+
+def embed_signatures(signed_manifest_path: str) -> list[tuple[str, bool, str]]:
+    """Phase three: embed every CMS blob from the signed manifest."""
+    manifest = _read_manifest(signed_manifest_path)
+    results = []
+    for doc in manifest["documents"]:
+        try:
+            embed_signature(doc)
+            results.append((doc["path"], True, "Semnat cu succes"))
+        except Exception as e:
+            results.append((doc["path"], False, str(e)))
+    return results
@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 
 import pkcs11
 from pkcs11 import Attribute, ObjectClass
@@ -31,7 +32,14 @@ def _get_bundled_lib_paths() -> list[str]:
 
 
 class TokenManager:
-    """Manages PKCS#11 library loading, token detection, and certificate enumeration."""
+    """Manages PKCS#11 library loading, token detection, and certificate enumeration.
+
+    A logged-in session is kept open across signing batches until it has been
+    idle for ``idle_timeout`` seconds, the token is removed, or ``close()`` is
+    called, so the user only enters the PIN once.
+    """
+
+    DEFAULT_IDLE_TIMEOUT = 300.0
 
     SYSTEM_LIB_PATHS = [
         "/Applications/CryptoUserTools.app/Contents/lib/mac/libcryptoide_pkcs11.dylib",
@@ -41,10 +49,15 @@ class TokenManager:
         "/Library/OpenSC/lib/opensc-pkcs11.so",
     ]
 
-    def __init__(self):
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
         self._lib = None
         self._lib_path = None
         self._session = None
+        self._slot_index = None
+        self._token_serial = ""
+        self._pin = None
+        self._last_used = 0.0
+        self.idle_timeout = idle_timeout
 
     @property
     def session(self):
@@ -55,6 +68,8 @@ class TokenManager:
         return self._lib_path
 
     def load_library(self, path: str) -> None:
+        # Reloading finalizes the library, which invalidates any open session
+        self.close()
         self._lib = pkcs11.lib(path)
         self._lib_path = path
 
@@ -86,8 +101,66 @@ class TokenManager:
         return tokens
 
     def open_session(self, slot_index: int, pin: str) -> None:
+        """Log in to the token and keep the session for later batches."""
+        self.close()
         token = self._lib.get_slots()[slot_index].get_token()
         self._session = token.open(user_pin=pin)
+        self._slot_index = slot_index
+        self._token_serial = token.serial.hex() if token.serial else ""
+        self._pin = pin
+        self.touch()
+
+    def has_session(self, slot_index: int) -> bool:
+        """Return True if a non-expired session is open on the given slot."""
+        if not self._session or self._slot_index != slot_index:
+            return False
+        return not self.is_idle_expired()
+
+    def touch(self) -> None:
+        self._last_used = time.monotonic()
+
+    def is_idle_expired(self) -> bool:
+        if not self._session or self.idle_timeout <= 0:
+            return False
+        return time.monotonic() - self._last_used > self.idle_timeout
+
+    def is_session_token_present(self) -> bool:
+        """Check that the token the session was opened on is still plugged in."""
+        if not self._session:
+            return False
+        try:
+            token = self._lib.get_slots()[self._slot_index].get_token()
+        except Exception:
+            return False
+        serial = token.serial.hex() if token.serial else ""
+        return serial == self._token_serial
+
+    def ensure_session(self) -> bool:
+        """Make sure the kept session is usable, logging in again if needed.
+
+        Returns False if there is no session to revive or re-login failed;
+        the caller should then ask the user for the PIN again.
+        """
+        if not self._session:
+            return False
+        try:
+            # Cheap round-trip to detect a session the token has dropped
+            next(iter(self._session.get_objects({Attribute.CLASS: ObjectClass.CERTIFICATE})), None)
+            self.touch()
+            return True
+        except Exception:
+            pass
+        # Never send the cached PIN to a different token put in the same slot
+        if not self.is_session_token_present():
+            self.close()
+            return False
+        slot_index, pin = self._slot_index, self._pin
+        try:
+            self.open_session(slot_index, pin)
+            return True
+        except Exception:
+            self.close()
+            return False
 
     def list_certificates(self) -> list[dict]:
         if not self._session:
@@ -122,9 +195,13 @@ class TokenManager:
         return certs
 
     def close(self):
+        """Log out, close the session and forget the cached PIN."""
         if self._session:
             try:
                 self._session.close()
             except Exception:
                 pass
             self._session = None
+        self._slot_index = None
+        self._token_serial = ""
+        self._pin = None
@@ -10,6 +10,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor
 
+from pdf_signer.core.backends import create_backend
+from pdf_signer.core.config import default_config, load_config
 from pdf_signer.core.token_manager import TokenManager
 from pdf_signer.core.signer import PdfSigner
 from pdf_signer.core.worker import SigningWorker
@@ -23,7 +25,15 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(850, 600)
         self.setAcceptDrops(True)
 
-        self.token_manager = TokenManager()
+        try:
+            self.config = load_config()
+        except ValueError as e:
+            QMessageBox.warning(
+                self, "Configuration Error",
+                f"{e}\n\nUsing the crypto token (pkcs11) with default settings."
+            )
+            self.config = default_config()
+        self.token_manager = TokenManager(idle_timeout=self.config["session_timeout"])
         self.pdf_files: list[str] = []
         self.signing_worker: SigningWorker | None = None
         self._tokens: list[dict] = []
@@ -196,11 +206,14 @@ class MainWindow(QMainWindow):
     def _refresh_tokens(self):
         if not self.token_manager.lib_path:
             return
-        # Reload library to refresh slot state
-        try:
-            self.token_manager.load_library(self.token_manager.lib_path)
-        except Exception:
-            pass
+        # Reload library to refresh slot state, unless that would log out a
+        # session kept for a token that is still plugged in
+        logged_in = self.token_manager.session and self.token_manager.is_session_token_present()
+        if not logged_in:
+            try:
+                self.token_manager.load_library(self.token_manager.lib_path)
+            except Exception:
+                pass
 
         self._tokens = self.token_manager.get_tokens()
         self.token_combo.clear()
@@ -208,7 +221,7 @@ class MainWindow(QMainWindow):
             for t in self._tokens:
                 self.token_combo.addItem(f"{t['label']} ({t['serial'][:8]}...)")
             self._set_status_color("#22c55e")
-            self.status_label.setText("Token connected")
+            self.status_label.setText("Token connected (logged in)" if logged_in else "Token connected")
         else:
             self._set_status_color("red")
             self.status_label.setText("No token detected")
@@ -222,6 +235,18 @@ class MainWindow(QMainWindow):
     def _poll_token_status(self):
         if not self.token_manager.lib_path:
             return
+        # The worker thread owns the session while a batch is running
+        if self.signing_worker and self.signing_worker.isRunning():
+            return
+        if self.token_manager.session:
+            if (self.token_manager.is_idle_expired()
+                    or not self.token_manager.is_session_token_present()):
+                # Lock: drop the session and cached PIN, fall through to re-detect
+                self.token_manager.close()
+            else:
+                self._set_status_color("#22c55e")
+                self.status_label.setText("Token connected (logged in)")
+                return
         try:
             self.token_manager.load_library(self.token_manager.lib_path)
             tokens = self.token_manager.get_tokens()
@@ -314,33 +339,57 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No Files", "Add PDF files first.")
             return
 
+        if self.config["backend"] == "pkcs11":
+            backend = self._token_backend()
+        else:
+            try:
+                backend = create_backend(self.config)
+            except Exception as e:
+                QMessageBox.critical(self, "Signing Key Error", f"Failed to load signing key:\n{e}")
+                return
+        if backend is None:
+            return
+
+        # Reset statuses
+        for row in range(self.table.rowCount()):
+            status_item = QTableWidgetItem("Pending")
+            status_item.setForeground(QColor("#64748b"))
+            self.table.setItem(row, 3, status_item)
+
+        # Start signing
+        signer = PdfSigner(backend)
+        self.signing_worker = SigningWorker(signer, list(self.pdf_files))
+        self.signing_worker.progress.connect(self._on_progress)
+        self.signing_worker.file_done.connect(self._on_file_done)
+        self.signing_worker.all_done.connect(self._on_all_done)
+
+        self._set_signing_ui(True)
+        self.progress_bar.setMaximum(len(self.pdf_files))
+        self.progress_bar.setValue(0)
+        self.signing_worker.start()
+
+    def _token_backend(self):
         if not self._tokens:
             QMessageBox.warning(self, "No Token", "No crypto token detected.\nConnect your token and click Refresh.")
-            return
+            return None
 
         token_idx = self.token_combo.currentIndex()
         if token_idx < 0:
-            return
+            return None
         token_info = self._tokens[token_idx]
 
-        # Ask for PIN
-        self._pin_attempts = 0
-        pin = self._ask_pin(token_info["label"])
-        if pin is None:
-            return
-
-        # Open session and list certs
-        try:
-            self.token_manager.open_session(token_info["slot_index"], pin)
-        except Exception as e:
-            QMessageBox.critical(self, "PIN Error", f"Failed to open session:\n{e}")
-            return
+        # Reuse the session from a previous batch, or ask for PIN and log in
+        slot_index = token_info["slot_index"]
+        if not (self.token_manager.has_session(slot_index) and self.token_manager.ensure_session()):
+            self._pin_attempts = 0
+            if not self._login(token_info):
+                return None
 
         certs = self.token_manager.list_certificates()
         if not certs:
             QMessageBox.critical(self, "No Certificates", "No signing certificates found on this token.")
             self.token_manager.close()
-            return
+            return None
 
         # Select certificate
         self.cert_combo.clear()
@@ -354,39 +403,19 @@ class MainWindow(QMainWindow):
             # Use first cert by default, user can change in combo
             pass
         cert_info = certs[cert_idx]
+        return create_backend(self.config, self.token_manager.session, cert_info)
 
-        # Reset statuses
-        for row in range(self.table.rowCount()):
-            status_item = QTableWidgetItem("Pending")
-            status_item.setForeground(QColor("#64748b"))
-            self.table.setItem(row, 3, status_item)
-
-        # Start signing
-        signer = PdfSigner(self.token_manager.session, cert_info)
-        self.signing_worker = SigningWorker(signer, list(self.pdf_files))
-        self.signing_worker.progress.connect(self._on_progress)
-        self.signing_worker.file_done.connect(self._on_file_done)
-        self.signing_worker.all_done.connect(self._on_all_done)
-
-        self._set_signing_ui(True)
-        self.progress_bar.setMaximum(len(self.pdf_files))
-        self.progress_bar.setValue(0)
-        self.signing_worker.start()
-
-    def _ask_pin(self, token_label: str) -> str | None:
+    def _login(self, token_info: dict) -> bool:
         while self._pin_attempts < 3:
-            dialog = PinDialog(token_label, self)
+            dialog = PinDialog(token_info["label"], self)
             pin = dialog.get_pin()
             if pin is None:
-                return None
-            # Validate PIN by trying to open session
+                return False
+            # The login that validates the PIN is the session used for signing
             try:
-                self.token_manager.open_session(
-                    self._tokens[self.token_combo.currentIndex()]["slot_index"], pin
-                )
-                self.token_manager.close()
+                self.token_manager.open_session(token_info["slot_index"], pin)
                 self._pin_attempts = 0
-                return pin
+                return True
             except Exception:
                 self._pin_attempts += 1
                 remaining = 3 - self._pin_attempts
@@ -400,8 +429,8 @@ class MainWindow(QMainWindow):
                         self, "PIN Blocked",
                         "Too many wrong PIN attempts.\nToken may be locked."
                     )
-                    return None
-        return None
+                    return False
+        return False
 
     def _cancel_signing(self):
         if self.signing_worker:
@@ -417,6 +446,13 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(signing)
         self.progress_label.setVisible(signing)
 
+    def closeEvent(self, event):
+        if self.signing_worker and self.signing_worker.isRunning():
+            self.signing_worker.cancel()
+            self.signing_worker.wait()
+        self.token_manager.close()
+        super().closeEvent(event)
+
     # ── Worker signals ───────────────────────────────────────────
 
     def _on_progress(self, current: int, total: int):
@@ -442,7 +478,8 @@ class MainWindow(QMainWindow):
 
     def _on_all_done(self, success_count: int, fail_count: int):
         self._set_signing_ui(False)
-        self.token_manager.close()
+        # Keep the session for the next batch; the idle timer starts now
+        self.token_manager.touch()
         self.progress_label.setText(
             f"Done: {success_count} signed, {fail_count} failed"
         )